@@ -14,6 +14,9 @@ class Interface:
     def get(self, sid):
         return self._make_request("GET", endpoint=sid)
 
+    def search(self, query):
+        return self._make_request("GET", params={'q': query})
+
     def get_all(self, payload=None):
         return self._make_request("GET", params=payload)
 
@@ -25,6 +28,10 @@ class Interface:
         headers = {'Content-Type': 'application/json'}
         return self._make_request("PUT", endpoint=sid, headers=headers, data=json.dumps(data))
 
+    def patch(self, sid, data):
+        headers = {'Content-Type': 'application/json'}
+        return self._make_request("PATCH", endpoint=sid, headers=headers, data=json.dumps(data))
+
     def delete(self, sid):
         return self._make_request("DELETE", endpoint=sid)
 
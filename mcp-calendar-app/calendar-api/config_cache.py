@@ -0,0 +1,19 @@
+import configparser
+import functools
+import json
+from collections import namedtuple
+
+DBConfig = namedtuple('DBConfig', ['db_name', 'table_name', 'columns', 'primary_key'])
+
+@functools.lru_cache(maxsize=1)
+def get_config(path: str = 'db.conf') -> DBConfig:
+    # Parse db.conf (and its JSON columns entry) once per process
+    config = configparser.ConfigParser()
+    config.read(path)
+    info = config['DEFAULT']
+    return DBConfig(
+        db_name=info.get('db_name'),
+        table_name=info.get('table_name'),
+        columns=json.loads(info.get('columns', '{}')),
+        primary_key=info.get('primary_key'),
+    )
@@ -1,12 +1,85 @@
 import sqlite3
 import os
+import functools
+import threading
+import contextlib
+import config_cache
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds
+MAX_SQL_VARIABLES = 999
+
+# Run PRAGMA optimize after this many writes through a ConnectionPool
+OPTIMIZE_EVERY_N_WRITES = 1000
+
+# SQL strings are built once per (table, column set) so the same text is reused
+# on every call and hits sqlite3's prepared statement cache
+@functools.lru_cache(maxsize=128)
+def _insert_sql(table_name: str, columns: tuple) -> str:
+    placeholders = ', '.join('?' for _ in columns)
+    return f'INSERT INTO {table_name} ({", ".join(columns)}) VALUES ({placeholders})'
+
+@functools.lru_cache(maxsize=128)
+def _update_sql(table_name: str, columns: tuple, cond_columns: tuple) -> str:
+    data_str = ', '.join([f"{k} = ?" for k in columns])
+    cond_str = ' AND '.join([f"{k} = ?" for k in cond_columns])
+    return f'UPDATE {table_name} SET {data_str} WHERE {cond_str}'
+
+@functools.lru_cache(maxsize=128)
+def _delete_sql(table_name: str, cond_columns: tuple) -> str:
+    cond_str = ' AND '.join([f"{k} = ?" for k in cond_columns])
+    return f'DELETE FROM {table_name} WHERE {cond_str}'
+
+@functools.lru_cache(maxsize=128)
+def _select_sql(table_name: str, cond_columns: tuple = ()) -> str:
+    if not cond_columns:
+        return f'SELECT * FROM {table_name}'
+    cond_str = ' AND '.join([f"{k} = ?" for k in cond_columns])
+    return f'SELECT * FROM {table_name} WHERE {cond_str}'
+
+@functools.lru_cache(maxsize=128)
+def _exists_sql(table_name: str, cond_columns: tuple) -> str:
+    cond_str = ' AND '.join([f"{k} = ?" for k in cond_columns])
+    return f'SELECT 1 FROM {table_name} WHERE {cond_str} LIMIT 1'
+
+@functools.lru_cache(maxsize=128)
+def _json_array_sql(columns: tuple, rows_sql: str, order_by: tuple) -> str:
+    # The rows are ordered in a subquery so json_group_array collects them in that order
+    pairs = ', '.join(f"'{c}', {c}" for c in columns)
+    if order_by:
+        rows_sql += f' ORDER BY {", ".join(order_by)}'
+    return f'SELECT json_group_array(json_object({pairs})) FROM ({rows_sql})'
+
+@functools.lru_cache(maxsize=128)
+def _json_select_sql(table_name: str, columns: tuple, cond_columns: tuple = (), order_by: tuple = ()) -> str:
+    cmd = f'SELECT * FROM {table_name}'
+    if cond_columns:
+        cmd += ' WHERE ' + ' AND '.join([f"{k} = ?" for k in cond_columns])
+    return _json_array_sql(columns, cmd, order_by)
+
+@functools.lru_cache(maxsize=128)
+def _json_search_sql(table_name: str, columns: tuple, search_columns: tuple, order_by: tuple = ()) -> str:
+    cond_str = ' OR '.join([f"py_lower({k}) LIKE ? ESCAPE '\\'" for k in search_columns])
+    return _json_array_sql(columns, f'SELECT * FROM {table_name} WHERE {cond_str}', order_by)
+
+def _py_lower(value):
+    # SQLite's LIKE only folds ASCII case; lowering both sides with str.lower makes
+    # searches match the way the MCP server's in-memory search does
+    return value.lower() if isinstance(value, str) else value
 
 class DatabaseHandler:
-    def __init__(self, db_name: str, check_same_thread: bool = True):
+    def __init__(self, db_name: str, check_same_thread: bool = True, read_only: bool = False, schema: dict = None):
         self.db_name = db_name
+        self.read_only = read_only
+        # Table and column names are interpolated into SQL, so only names from
+        # the configured schema ({table_name: columns}) are accepted
+        if schema is None:
+            cfg = config_cache.get_config()
+            schema = {cfg.table_name: cfg.columns}
+        self._schema = {table: frozenset(cols) for table, cols in schema.items()}
+        self._columns = {table: tuple(cols) for table, cols in schema.items()}
         # If db_name is already a full path (contains /), use it as-is
         # Otherwise, append .db extension
-        if '/' in db_name or db_name.endswith('.db'):
+        if db_name == ':memory:' or '/' in db_name or db_name.endswith('.db'):
             db_path = db_name
         else:
             db_path = f'{db_name}.db'
@@ -16,45 +89,182 @@ class DatabaseHandler:
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir, exist_ok=True)
 
-        self.conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+        self.conn = sqlite3.connect(db_path, check_same_thread=check_same_thread, cached_statements=256)
+        if db_path != ':memory:':
+            # WAL lets readers proceed during writes and needs one fsync per commit instead of two
+            self.conn.executescript(
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA cache_size=-65536;"
+                "PRAGMA mmap_size=268435456;"
+            )
+        self.conn.create_function('py_lower', 1, _py_lower, deterministic=True)
+        if read_only:
+            self.conn.execute("PRAGMA query_only=1")
         self.c = self.conn.cursor()
 
-    def execute(self, cmd: str, params=()):
+    def optimize(self):
+        # Let SQLite refresh planner statistics that have gone stale
+        self.execute("PRAGMA optimize")
+
+    def close(self):
+        # Read-only connections can't write the statistics PRAGMA optimize gathers
+        if not self.read_only:
+            self.optimize()
+        self.conn.close()
+
+    def _check_identifiers(self, table_name: str, columns):
+        allowed = self._schema.get(table_name)
+        if allowed is None:
+            raise ValueError(f"Unknown table: {table_name}")
+        if not allowed.issuperset(columns):
+            raise ValueError(f"Unknown column(s) for {table_name}: {', '.join(sorted(set(columns) - allowed))}")
+
+    def execute(self, cmd: str, params=(), autocommit: bool = True):
         try:
             self.c.execute(cmd, params)
-            self.conn.commit()
+            if autocommit:
+                self.conn.commit()
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
 
-    def create_table(self, table_name: str, columns: dict):
+    def execute_write(self, cmd: str, params=(), autocommit: bool = True):
+        # Errors propagate (unlike execute) so callers can report them; a failed
+        # autocommitted statement is rolled back so it doesn't keep the write lock
+        try:
+            self.c.execute(cmd, params)
+        except sqlite3.Error:
+            if autocommit:
+                self.rollback()
+            raise
+        if autocommit:
+            self.conn.commit()
+
+    def executemany(self, cmd: str, seq_of_params, autocommit: bool = True):
+        # Errors propagate (unlike execute) so a caller batching rows in its own
+        # transaction can roll the whole batch back
+        self.c.executemany(cmd, seq_of_params)
+        if autocommit:
+            self.conn.commit()
+
+    def begin(self):
+        # Open an explicit transaction so a batch of writes shares one commit
+        self.conn.execute("BEGIN")
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    @staticmethod
+    def _create_table_sql(table_name: str, columns: dict, primary_key: str = None, without_rowid: bool = False):
         columns_str = ', '.join([f"{k} {v}" for k, v in columns.items()])
+        if primary_key:
+            columns_str += f', PRIMARY KEY ({primary_key})'
         cmd = f'CREATE TABLE IF NOT EXISTS {table_name} ({columns_str})'
-        self.execute(cmd)
+        if without_rowid:
+            cmd += ' WITHOUT ROWID'
+        return cmd
+
+    def create_table(self, table_name: str, columns: dict, primary_key: str = None, without_rowid: bool = False):
+        self.execute(self._create_table_sql(table_name, columns, primary_key, without_rowid))
+
+    def table_sql(self, table_name: str):
+        # Return the CREATE TABLE statement for table_name, or None if it doesn't exist
+        self.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,), autocommit=False)
+        row = self.c.fetchone()
+        return row[0] if row else None
 
-    def insert_data(self, table_name: str, columns: dict, data: dict):
-        placeholders = ', '.join('?' for _ in data)
-        cmd = f'INSERT INTO {table_name} ({", ".join(data.keys())}) VALUES ({placeholders})'
-        self.execute(cmd, tuple(data.values()))
+    def rebuild_table(self, table_name: str, columns: dict, primary_key: str = None, without_rowid: bool = False):
+        # Copy all rows into a table created with the new definition, then swap it in.
+        # A row the new definition rejects (e.g. a duplicate or NULL primary key) aborts
+        # the whole copy, so the original table is left untouched and the error is raised
+        new_table = f'{table_name}_new'
+        cols = ', '.join(columns.keys())
+        self.begin()
+        try:
+            self.c.execute(f'DROP TABLE IF EXISTS {new_table}')
+            self.c.execute(self._create_table_sql(new_table, columns, primary_key, without_rowid))
+            self.c.execute(f'INSERT INTO {new_table} ({cols}) SELECT {cols} FROM {table_name}')
+            self.c.execute(f'DROP TABLE {table_name}')
+            self.c.execute(f'ALTER TABLE {new_table} RENAME TO {table_name}')
+        except sqlite3.Error:
+            self.rollback()
+            raise
+        self.commit()
+
+    def ensure_table(self, table_name: str, columns: dict, primary_key: str = None) -> bool:
+        # Create table_name if it is missing and migrate a table created before the primary
+        # key was introduced (a plain rowid table) to WITHOUT ROWID. Returns True if migrated
+        self.create_table(table_name=table_name, columns=columns,
+                          primary_key=primary_key, without_rowid=bool(primary_key))
+        if not primary_key or 'WITHOUT ROWID' in self.table_sql(table_name).upper():
+            return False
+        try:
+            self.rebuild_table(table_name=table_name, columns=columns,
+                               primary_key=primary_key, without_rowid=True)
+        except sqlite3.IntegrityError as e:
+            # Legacy rows the key rejects: keep serving the old table rather than fail startup
+            duplicates, nulls = self.conflicting_keys(table_name, primary_key)
+            print(f"Not migrating '{table_name}' to PRIMARY KEY ({primary_key}): {e}. "
+                  f"Duplicate {primary_key} values: {duplicates}; rows with NULL {primary_key}: {nulls}. "
+                  f"Remove or re-key those rows, then restart to migrate.")
+            return False
+        # The rebuilt table has no statistics yet
+        self.analyze(table_name)
+        return True
+
+    def conflicting_keys(self, table_name: str, key_col: str):
+        # (values of key_col that occur more than once, number of rows where it is NULL)
+        self._check_identifiers(table_name, (key_col,))
+        self.execute(f'SELECT {key_col} FROM {table_name} WHERE {key_col} IS NOT NULL '
+                     f'GROUP BY {key_col} HAVING count(*) > 1', autocommit=False)
+        duplicates = [row[0] for row in self.c.fetchall()]
+        self.execute(f'SELECT count(*) FROM {table_name} WHERE {key_col} IS NULL', autocommit=False)
+        return duplicates, self.c.fetchone()[0]
+
+    def analyze(self, table_name: str = None):
+        # Refresh the query planner's statistics (all tables when table_name is None)
+        if table_name is not None:
+            self._check_identifiers(table_name, ())
+        self.execute(f'ANALYZE {table_name}' if table_name else 'ANALYZE')
+
+    def insert_data(self, table_name: str, columns: dict, data: dict, autocommit: bool = True):
+        keys = tuple(sorted(data))
+        self._check_identifiers(table_name, keys)
+        self.execute_write(_insert_sql(table_name, keys), tuple(data[k] for k in keys), autocommit=autocommit)
+
+    def insert_many_executemany(self, table_name: str, columns, rows, autocommit: bool = True):
+        # One prepared INSERT reused for every row: no re-parse and no bound-parameter limit
+        columns = tuple(columns)
+        self._check_identifiers(table_name, columns)
+        params = (tuple(row[c] for c in columns) for row in rows)
+        self.executemany(_insert_sql(table_name, columns), params, autocommit=autocommit)
 
     def update_data(self, table_name: str, data: dict, condition: dict):
-        data_str = ', '.join([f"{k} = ?" for k in data.keys()])
-        cond_str = ' AND '.join([f"{k} = ?" for k in condition.keys()])
-        cmd = f'UPDATE {table_name} SET {data_str} WHERE {cond_str}'
-        self.execute(cmd, tuple(data.values()) + tuple(condition.values()))
+        keys = tuple(sorted(data))
+        cond_keys = tuple(sorted(condition))
+        self._check_identifiers(table_name, keys + cond_keys)
+        params = tuple(data[k] for k in keys) + tuple(condition[k] for k in cond_keys)
+        self.execute_write(_update_sql(table_name, keys, cond_keys), params)
+        return self.c.rowcount
 
     def delete_data(self, table_name: str, condition: dict):
-        cond_str = ' AND '.join([f"{k} = ?" for k in condition.keys()])
-        cmd = f'DELETE FROM {table_name} WHERE {cond_str}'
-        self.execute(cmd, tuple(condition.values()))
+        cond_keys = tuple(sorted(condition))
+        self._check_identifiers(table_name, cond_keys)
+        self.execute_write(_delete_sql(table_name, cond_keys), tuple(condition[k] for k in cond_keys))
+        return self.c.rowcount
 
     def fetch_data(self, table_name: str, condition: dict = None):
         if condition:
-            cond_str = ' AND '.join([f"{k} = ?" for k in condition.keys()])
-            cmd = f'SELECT * FROM {table_name} WHERE {cond_str}'
-            self.execute(cmd, tuple(condition.values()))
+            cond_keys = tuple(sorted(condition))
+            self._check_identifiers(table_name, cond_keys)
+            self.execute(_select_sql(table_name, cond_keys), tuple(condition[k] for k in cond_keys), autocommit=False)
         else:
-            cmd = f'SELECT * FROM {table_name}'
-            self.execute(cmd)
+            self._check_identifiers(table_name, ())
+            self.execute(_select_sql(table_name), autocommit=False)
         
         # Get column names
         columns = [description[0] for description in self.c.description] if self.c.description else []
@@ -66,15 +276,112 @@ class DatabaseHandler:
             result.append(dict(zip(columns, row)))
         return result
 
+    def fetch_rows_json(self, table_name: str, condition: dict = None, order_by: tuple = ()) -> str:
+        # SQLite serializes the rows to a JSON array itself, so no per-row dicts are built
+        cond_keys = tuple(sorted(condition)) if condition else ()
+        self._check_identifiers(table_name, cond_keys + tuple(order_by))
+        cmd = _json_select_sql(table_name, self._columns[table_name], cond_keys, tuple(order_by))
+        self.execute(cmd, tuple(condition[k] for k in cond_keys), autocommit=False)
+        row = self.c.fetchone()
+        return row[0] if row else '[]'
+
+    def search_rows_json(self, table_name: str, search_columns: tuple, text: str, order_by: tuple = ()) -> str:
+        # Rows where any of search_columns contains text, ignoring case (Unicode-aware)
+        self._check_identifiers(table_name, tuple(search_columns) + tuple(order_by))
+        pattern = '%' + text.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        cmd = _json_search_sql(table_name, self._columns[table_name], search_columns, tuple(order_by))
+        self.execute(cmd, (pattern,) * len(search_columns), autocommit=False)
+        row = self.c.fetchone()
+        return row[0] if row else '[]'
+
     def check_existence(self, table_name: str, condition: dict):
-        result = self.fetch_data(table_name, condition)
-        return bool(result)
+        cond_keys = tuple(sorted(condition))
+        self._check_identifiers(table_name, cond_keys)
+        self.execute(_exists_sql(table_name, cond_keys), tuple(condition[k] for k in cond_keys), autocommit=False)
+        return self.c.fetchone() is not None
+
+    def existing_keys(self, table_name: str, key_col: str, values) -> set:
+        # Single IN (...) lookup per chunk instead of one existence check per value
+        self._check_identifiers(table_name, (key_col,))
+        values = list(values)
+        found = set()
+        for start in range(0, len(values), MAX_SQL_VARIABLES):
+            chunk = values[start:start + MAX_SQL_VARIABLES]
+            placeholders = ', '.join('?' for _ in chunk)
+            cmd = f'SELECT {key_col} FROM {table_name} WHERE {key_col} IN ({placeholders})'
+            self.execute(cmd, tuple(chunk), autocommit=False)
+            found.update(row[0] for row in self.c.fetchall())
+        return found
+
+    def delete_keys(self, table_name: str, key_col: str, values, autocommit: bool = True):
+        self._check_identifiers(table_name, (key_col,))
+        values = list(values)
+        for start in range(0, len(values), MAX_SQL_VARIABLES):
+            chunk = values[start:start + MAX_SQL_VARIABLES]
+            placeholders = ', '.join('?' for _ in chunk)
+            cmd = f'DELETE FROM {table_name} WHERE {key_col} IN ({placeholders})'
+            self.execute_write(cmd, tuple(chunk), autocommit=autocommit)
+
+class ConnectionPool:
+    """One shared writer connection plus a read-only connection per thread.
+
+    SQLite allows a single writer at a time, so writes are serialized on a lock
+    while readers (in WAL mode) run concurrently on their own connections.
+    """
+    def __init__(self, db_name: str):
+        self.db_name = db_name
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._write_count = 0
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def writer(self):
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = DatabaseHandler(self.db_name, check_same_thread=False)
+            try:
+                yield self._writer
+            except BaseException:
+                # Never hand the next caller a connection stuck in a failed transaction
+                if self._writer.conn.in_transaction:
+                    self._writer.rollback()
+                raise
+            self._write_count += 1
+            if self._write_count % OPTIMIZE_EVERY_N_WRITES == 0:
+                self._writer.optimize()
+
+    def reader(self) -> DatabaseHandler:
+        dbh = getattr(self._local, 'dbh', None)
+        if dbh is None:
+            # check_same_thread=False only so close() can run from the exiting thread
+            dbh = DatabaseHandler(self.db_name, check_same_thread=False, read_only=True)
+            self._local.dbh = dbh
+            with self._readers_lock:
+                self._readers.append(dbh)
+        return dbh
+
+    def close(self):
+        with self._readers_lock:
+            for dbh in self._readers:
+                dbh.close()
+            self._readers.clear()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_name: str) -> ConnectionPool:
+    with _pools_lock:
+        if db_name not in _pools:
+            _pools[db_name] = ConnectionPool(db_name)
+        return _pools[db_name]
 
 if __name__ == '__main__':
     dbh = DatabaseHandler(db_name="CalendarDB")
-    print(dbh.check_existence(
-        'calendar',
-        {"sid": "TEXT", "name": "TEXT", "content": "TEXT", "category": "TEXT", "level": "INTEGER",
-         "status": "REAL", "creation_time": "TEXT", "start_time": "TEXT", "end_time": "TEXT"},
-        {"sid": "22"}
-    ))
+    print(dbh.check_existence('calendar', {"sid": "22"}))
@@ -1,53 +1,41 @@
-import configparser
-import json
-import datetime
+import config_cache
 
 class Method:
     def __init__(self, conf_file):
-        self.config = configparser.ConfigParser()
-        self.config.read(conf_file)
-        self.info = self.config['DEFAULT']
-        self.columns = json.loads(self.info['columns'])
-
-    def check_params(self, jsn):
-        # Accept priority levels 1, 2, 3 (Low, Medium, High)
-        if jsn['level'] not in [1, 2, 3]:
-            return False
-        if not (0 <= jsn['status'] <= 1):
-            return False
-        try:
-            for t in ['creation_time', 'start_time', 'end_time']:
-                datetime.datetime.strptime(jsn[t], '%Y-%m-%d %H:%M:%S')
-        except ValueError:
-            return False
-        return True
+        self.config = config_cache.get_config(conf_file)
+        self.table_name = self.config.table_name
+        self.columns = self.config.columns
 
     def get(self, dbh, schedule_id):
         return dbh.fetch_data(
-            table_name=self.info['table_name'],
+            table_name=self.table_name,
             condition={'sid': schedule_id})
 
+    # Field constraints are enforced by the Schedule model before these are called.
+    # post/update return (ok, schedule_dict) so the caller can reuse the dumped dict
     def post(self, dbh, schedule):
-        if dbh.check_existence(self.info['table_name'], {'sid': schedule.sid}):
-            return False
-        if not self.check_params(schedule.dict()):
-            return False
-        dbh.insert_data(self.info['table_name'], self.columns, schedule.dict())
-        return True
+        schedule_dict = schedule.model_dump()
+        if dbh.check_existence(self.table_name, {'sid': schedule_dict['sid']}):
+            return False, schedule_dict
+        dbh.insert_data(self.table_name, self.columns, schedule_dict)
+        return True, schedule_dict
 
+    # update/delete rely on the affected row count instead of a separate existence check
     def update(self, dbh, schedule_id, schedule):
-        if not dbh.check_existence(self.info['table_name'], {'sid': schedule_id}):
-            return False
-        if not self.check_params(schedule.dict()):
-            return False
-        dbh.update_data(self.info['table_name'], schedule.dict(), {'sid': schedule_id})
-        return True
+        schedule_dict = schedule.model_dump()
+        rows = dbh.update_data(self.table_name, schedule_dict, {'sid': schedule_id})
+        return rows > 0, schedule_dict
+
+    # Returns the full row after applying the non-null fields of changes, or None if missing
+    def patch(self, dbh, schedule_id, changes):
+        changes_dict = changes.model_dump(exclude_none=True)
+        if changes_dict and dbh.update_data(self.table_name, changes_dict, {'sid': schedule_id}) == 0:
+            return None
+        rows = self.get(dbh, schedule_id)
+        return rows[0] if rows else None
 
     def delete(self, dbh, schedule_id):
-        if not dbh.check_existence(self.info['table_name'], {'sid': schedule_id}):
-            return False
-        dbh.delete_data(self.info['table_name'], {'sid': schedule_id})
-        return True
+        return dbh.delete_data(self.table_name, {'sid': schedule_id}) > 0
 
 if __name__ == '__main__':
     m = Method(conf_file='db.conf')
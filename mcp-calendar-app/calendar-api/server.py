@@ -1,17 +1,20 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import configparser
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Annotated, Literal, Optional
+import config_cache
 import database_handler
 import method
+import atexit
 import os
-import json
+import re
+import sqlite3
+import datetime
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI()
 
-config = configparser.ConfigParser()
-config.read('db.conf')
-info = config['DEFAULT']
+cfg = config_cache.get_config()
 
 # Use DATABASE_PATH environment variable if available, otherwise use db.conf
 db_path = os.getenv('DATABASE_PATH')
@@ -19,13 +22,19 @@ if db_path:
     # Remove .db extension if present in the path, as DatabaseHandler will handle it
     db_name = db_path.replace('.db', '')
 else:
-    db_name = info['db_name']
+    db_name = cfg.db_name
 
-dbh = database_handler.DatabaseHandler(db_name=db_name, check_same_thread=False)
+# Writes go through the pool's single locked writer, reads use per-thread read-only connections
+pool = database_handler.get_pool(db_name)
+# Closing runs PRAGMA optimize on the writer so query plans stay current across restarts
+atexit.register(pool.close)
 
-# Ensure the table exists on startup
-columns = json.loads(info['columns'])
-dbh.create_table(table_name=info['table_name'], columns=columns)
+# Ensure the table exists (migrating a legacy rowid table to its primary key) on startup;
+# the read-only check avoids taking the schema write lock in every worker once it is current
+table_sql = pool.reader().table_sql(cfg.table_name)
+if table_sql is None or (cfg.primary_key and 'WITHOUT ROWID' not in table_sql.upper()):
+    with pool.writer() as dbh:
+        dbh.ensure_table(table_name=cfg.table_name, columns=cfg.columns, primary_key=cfg.primary_key)
 
 m = method.Method(conf_file='db.conf')
 
@@ -38,46 +47,113 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Wire format for timestamps: YYYY-MM-DD HH:MM:SS
+_TS_RE = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+
+def _check_timestamp(value: str) -> str:
+    # The regex pins the exact format, fromisoformat rejects impossible dates
+    if not _TS_RE.match(value):
+        raise ValueError('must be in YYYY-MM-DD HH:MM:SS format')
+    datetime.datetime.fromisoformat(value)
+    return value
+
 class Schedule(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     sid: str
     name: str
     content: str
     category: str
-    level: int
-    status: float
+    level: Literal[1, 2, 3]  # Low, Medium, High
+    status: Annotated[float, Field(ge=0, le=1)]
     creation_time: str
     start_time: str
     end_time: str
 
+    @field_validator('creation_time', 'start_time', 'end_time')
+    @classmethod
+    def check_timestamp(cls, value: str) -> str:
+        return _check_timestamp(value)
+
+class ScheduleUpdate(BaseModel):
+    """Partial update for PATCH: only the fields that are set are written."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    name: Optional[str] = None
+    content: Optional[str] = None
+    category: Optional[str] = None
+    level: Optional[Literal[1, 2, 3]] = None
+    status: Optional[Annotated[float, Field(ge=0, le=1)]] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+
+    @field_validator('start_time', 'end_time')
+    @classmethod
+    def check_timestamp(cls, value: Optional[str]) -> Optional[str]:
+        return value if value is None else _check_timestamp(value)
+
 @app.get('/')
 def index():
     return {'app_name': 'calendar'}
 
+# Schedule listings are returned earliest first; the primary-key table has no insertion order
+_LIST_ORDER = ('start_time', 'sid')
+
 @app.get('/schedules')
-def get_schedules():
-    return dbh.fetch_data(info['table_name'])
+def get_schedules(q: Optional[str] = None):
+    # Rows are serialized to JSON inside SQLite, bypassing FastAPI's encoder.
+    # q narrows the list to schedules whose name or content contains it
+    if q is None:
+        content = pool.reader().fetch_rows_json(cfg.table_name, order_by=_LIST_ORDER)
+    else:
+        content = pool.reader().search_rows_json(cfg.table_name, ('name', 'content'), q, order_by=_LIST_ORDER)
+    return Response(content=content, media_type="application/json")
 
 @app.get('/schedules/{schedule_id}')
 def get_schedule(schedule_id: str):
-    schedule = m.get(dbh, schedule_id)
+    schedule = m.get(pool.reader(), schedule_id)
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     return schedule
 
 @app.post('/schedules')
 def create_schedule(schedule: Schedule):
-    if not m.post(dbh, schedule):
-        raise HTTPException(status_code=400, detail="Schedule already exists or invalid data")
-    return schedule
+    try:
+        with pool.writer() as dbh:
+            created, schedule_dict = m.post(dbh, schedule)
+    except sqlite3.IntegrityError as e:
+        raise HTTPException(status_code=409, detail=f"Schedule conflicts with an existing one: {e}")
+    if not created:
+        raise HTTPException(status_code=400, detail="Schedule already exists")
+    return schedule_dict
 
 @app.put('/schedules/{schedule_id}')
 def update_schedule(schedule_id: str, schedule: Schedule):
-    if not m.update(dbh, schedule_id, schedule):
-        raise HTTPException(status_code=404, detail="Schedule not found or invalid data")
+    # Changing a schedule's sid through PUT would re-key the row
+    if schedule.sid != schedule_id:
+        raise HTTPException(status_code=400, detail="Schedule sid in the body must match the URL")
+    try:
+        with pool.writer() as dbh:
+            updated, schedule_dict = m.update(dbh, schedule_id, schedule)
+    except sqlite3.IntegrityError as e:
+        raise HTTPException(status_code=409, detail=f"Schedule conflicts with an existing one: {e}")
+    if not updated:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return schedule_dict
+
+@app.patch('/schedules/{schedule_id}')
+def patch_schedule(schedule_id: str, changes: ScheduleUpdate):
+    # Saves clients the GET they would otherwise need to build a full PUT body
+    with pool.writer() as dbh:
+        schedule = m.patch(dbh, schedule_id, changes)
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
     return schedule
 
 @app.delete('/schedules/{schedule_id}')
 def delete_schedule(schedule_id: str):
-    if not m.delete(dbh, schedule_id):
+    with pool.writer() as dbh:
+        deleted = m.delete(dbh, schedule_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Schedule not found")
     return {"message": "Schedule deleted successfully"}
@@ -3,17 +3,11 @@
 Test data script to populate the calendar database with sample schedules
 """
 
-import json
 from datetime import datetime, timedelta
+import config_cache
 import database_handler
-import configparser
 import os
 
-def load_config():
-    config = configparser.ConfigParser()
-    config.read('db.conf')
-    return config['DEFAULT']
-
 def get_db_path():
     """Get database path from environment variable or config"""
     db_path = os.getenv('DATABASE_PATH')
@@ -21,16 +15,20 @@ def get_db_path():
         # Remove .db extension if present in the path
         return db_path.replace('.db', '')
     else:
-        info = load_config()
-        return info['db_name']
+        return config_cache.get_config().db_name
 
 def create_test_schedules():
     """Create Redwood Digital University schedules for teachers and students"""
     
-    # Get current date and create schedules for this month
+    # Format "now" and the dates around today once; timedelta also rolls over
+    # month and year boundaries correctly
     today = datetime.now()
-    current_month = today.month
-    current_year = today.year
+    now_str = today.strftime("%Y-%m-%d %H:%M:%S")
+    now_time = now_str[11:]
+    days = [(today + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(-2, 8)]
+
+    def at(offset, time):
+        return days[offset + 2] + " " + time
     
     test_schedules = [
         # Today - Classes and Academic Activities
@@ -41,9 +39,9 @@ def create_test_schedules():
             "category": "Lecture",
             "level": 3,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{today.day:02d} 09:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{today.day:02d} 10:30:00"
+            "creation_time": now_str,
+            "start_time": at(0, "09:00:00"),
+            "end_time": at(0, "10:30:00")
         },
         {
             "sid": "office-hours-001",
@@ -52,9 +50,9 @@ def create_test_schedules():
             "category": "Office Hours",
             "level": 2,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{today.day:02d} 14:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{today.day:02d} 16:00:00"
+            "creation_time": now_str,
+            "start_time": at(0, "14:00:00"),
+            "end_time": at(0, "16:00:00")
         },
         # Tomorrow - Assignments and Labs
         {
@@ -64,9 +62,9 @@ def create_test_schedules():
             "category": "Lab",
             "level": 3,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 1):02d} 10:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 1):02d} 12:00:00"
+            "creation_time": now_str,
+            "start_time": at(1, "10:00:00"),
+            "end_time": at(1, "12:00:00")
         },
         {
             "sid": "assignment-due-001",
@@ -75,9 +73,9 @@ def create_test_schedules():
             "category": "Assignment",
             "level": 3,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 1):02d} 23:59:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 1):02d} 23:59:00"
+            "creation_time": now_str,
+            "start_time": at(1, "23:59:00"),
+            "end_time": at(1, "23:59:00")
         },
         # This week - Faculty and Student Activities
         {
@@ -87,9 +85,9 @@ def create_test_schedules():
             "category": "Meeting",
             "level": 2,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 2):02d} 15:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 2):02d} 16:30:00"
+            "creation_time": now_str,
+            "start_time": at(2, "15:00:00"),
+            "end_time": at(2, "16:30:00")
         },
         {
             "sid": "thesis-defense-001",
@@ -98,9 +96,9 @@ def create_test_schedules():
             "category": "Defense",
             "level": 3,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 3):02d} 14:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 3):02d} 16:00:00"
+            "creation_time": now_str,
+            "start_time": at(3, "14:00:00"),
+            "end_time": at(3, "16:00:00")
         },
         {
             "sid": "guest-lecture-001",
@@ -109,9 +107,9 @@ def create_test_schedules():
             "category": "Lecture",
             "level": 2,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 4):02d} 11:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 4):02d} 12:30:00"
+            "creation_time": now_str,
+            "start_time": at(4, "11:00:00"),
+            "end_time": at(4, "12:30:00")
         },
         # Weekend - Student Activities
         {
@@ -121,9 +119,9 @@ def create_test_schedules():
             "category": "Study Group",
             "level": 2,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 5):02d} 14:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 5):02d} 17:00:00"
+            "creation_time": now_str,
+            "start_time": at(5, "14:00:00"),
+            "end_time": at(5, "17:00:00")
         },
         {
             "sid": "workshop-001",
@@ -132,9 +130,9 @@ def create_test_schedules():
             "category": "Workshop",
             "level": 2,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 6):02d} 13:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 6):02d} 15:00:00"
+            "creation_time": now_str,
+            "start_time": at(6, "13:00:00"),
+            "end_time": at(6, "15:00:00")
         },
         # Past completed activities
         {
@@ -144,9 +142,9 @@ def create_test_schedules():
             "category": "Grading",
             "level": 2,
             "status": 1.0,
-            "creation_time": (today - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day - 1):02d} 09:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day - 1):02d} 17:00:00"
+            "creation_time": at(-1, now_time),
+            "start_time": at(-1, "09:00:00"),
+            "end_time": at(-1, "17:00:00")
         },
         {
             "sid": "seminar-completed-001",
@@ -155,9 +153,9 @@ def create_test_schedules():
             "category": "Seminar",
             "level": 3,
             "status": 1.0,
-            "creation_time": (today - timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day - 2):02d} 16:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day - 2):02d} 17:30:00"
+            "creation_time": at(-2, now_time),
+            "start_time": at(-2, "16:00:00"),
+            "end_time": at(-2, "17:30:00")
         },
         # Additional university activities
         {
@@ -167,9 +165,9 @@ def create_test_schedules():
             "category": "Meeting",
             "level": 2,
             "status": 0.0,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 7):02d} 10:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 7):02d} 11:30:00"
+            "creation_time": now_str,
+            "start_time": at(7, "10:00:00"),
+            "end_time": at(7, "11:30:00")
         },
         {
             "sid": "student-consultation-001",
@@ -178,9 +176,9 @@ def create_test_schedules():
             "category": "Advising",
             "level": 2,
             "status": 0.5,
-            "creation_time": today.strftime("%Y-%m-%d %H:%M:%S"),
-            "start_time": f"{current_year}-{current_month:02d}-{(today.day + 1):02d} 13:00:00",
-            "end_time": f"{current_year}-{current_month:02d}-{(today.day + 1):02d} 15:00:00"
+            "creation_time": now_str,
+            "start_time": at(1, "13:00:00"),
+            "end_time": at(1, "15:00:00")
         }
     ]
     
@@ -191,35 +189,41 @@ def populate_database():
     print("🗃️  Populating database with test data...")
 
     # Load configuration
-    info = load_config()
+    cfg = config_cache.get_config()
 
     # Initialize database handler with DATABASE_PATH env var or config
     db_name = get_db_path()
-    dbh = database_handler.DatabaseHandler(db_name=db_name, check_same_thread=False)
+    with database_handler.get_pool(db_name).writer() as dbh:
+        # Ensure the table exists before inserting data
+        print(f"📋 Ensuring table '{cfg.table_name}' exists...")
+        dbh.ensure_table(table_name=cfg.table_name, columns=cfg.columns, primary_key=cfg.primary_key)
 
-    # Ensure the table exists before inserting data
-    columns = json.loads(info['columns'])
-    print(f"📋 Ensuring table '{info['table_name']}' exists...")
-    dbh.create_table(table_name=info['table_name'], columns=columns)
-
-    # Create test schedules
-    test_schedules = create_test_schedules()
+        # Create test schedules
+        test_schedules = create_test_schedules()
     
-    # Insert test data
-    success_count = 0
-    for schedule in test_schedules:
+        # Insert test data in a single transaction (one commit instead of one per row)
+        dbh.begin()
         try:
-            # Check if schedule already exists
-            if not dbh.check_existence(info['table_name'], {'sid': schedule['sid']}):
-                dbh.insert_data(info['table_name'], json.loads(info['columns']), schedule)
-                print(f"✅ Added: {schedule['name']} ({schedule['category']})")
-                success_count += 1
-            else:
-                print(f"⚠️  Skipped: {schedule['name']} (already exists)")
+            # Look up which schedules already exist in one query
+            existing = dbh.existing_keys(cfg.table_name, 'sid', [s['sid'] for s in test_schedules])
+            new_schedules = []
+            for schedule in test_schedules:
+                if schedule['sid'] not in existing:
+                    new_schedules.append(schedule)
+                else:
+                    print(f"⚠️  Skipped: {schedule['name']} (already exists)")
+
+            dbh.insert_many_executemany(cfg.table_name, cfg.columns, new_schedules, autocommit=False)
         except Exception as e:
-            print(f"❌ Error adding {schedule['name']}: {e}")
+            dbh.rollback()
+            print(f"❌ Error adding test schedules, rolled back: {e}")
+            return
+        dbh.commit()
+
+    for schedule in new_schedules:
+        print(f"✅ Added: {schedule['name']} ({schedule['category']})")
     
-    print(f"\n🎉 Successfully added {success_count} test schedules!")
+    print(f"\n🎉 Successfully added {len(new_schedules)} test schedules!")
     print("📅 You can now view them in the frontend calendar.")
 
 def clear_test_data():
@@ -227,28 +231,29 @@ def clear_test_data():
     print("🗑️  Clearing test data...")
 
     # Load configuration
-    info = load_config()
+    cfg = config_cache.get_config()
 
     # Initialize database handler with DATABASE_PATH env var or config
     db_name = get_db_path()
-    dbh = database_handler.DatabaseHandler(db_name=db_name, check_same_thread=False)
     
     # Get test schedule IDs
     test_schedules = create_test_schedules()
     test_ids = [schedule['sid'] for schedule in test_schedules]
     
     # Remove test data
-    removed_count = 0
-    for sid in test_ids:
+    with database_handler.get_pool(db_name).writer() as dbh:
         try:
-            if dbh.check_existence(info['table_name'], {'sid': sid}):
-                dbh.delete_data(info['table_name'], {'sid': sid})
-                print(f"🗑️  Removed: {sid}")
-                removed_count += 1
+            existing = dbh.existing_keys(cfg.table_name, 'sid', test_ids)
+            removed_ids = [sid for sid in test_ids if sid in existing]
+            dbh.delete_keys(cfg.table_name, 'sid', removed_ids)
         except Exception as e:
-            print(f"❌ Error removing {sid}: {e}")
+            print(f"❌ Error removing test schedules: {e}")
+            return
+
+    for sid in removed_ids:
+        print(f"🗑️  Removed: {sid}")
     
-    print(f"\n✅ Removed {removed_count} test schedules!")
+    print(f"\n✅ Removed {len(removed_ids)} test schedules!")
 
 if __name__ == '__main__':
     import sys
@@ -8,16 +8,37 @@ Usage:
   Remote/SSE mode:             MCP_TRANSPORT=sse python server.py
 """
 
+import asyncio
+import bisect
+import json
 import logging
 import os
-from typing import Literal, Optional
+import re
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import quote
+from typing import Literal, Optional, get_args
 from fastmcp import FastMCP
 import aiohttp
 from datetime import datetime, timedelta
 
-# Configure logging
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+# Configure logging; DEBUG is opt-in via LOG_LEVEL=DEBUG
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger("calendar-mcp-server")
@@ -27,55 +48,230 @@ MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")  # "stdio" or "sse"
 MCP_PORT = int(os.getenv("MCP_PORT", "8080"))
 MCP_HOST = os.getenv("MCP_HOST", "0.0.0.0")
 CALENDAR_API_BASE_URL = os.getenv("CALENDAR_API_BASE_URL", "http://127.0.0.1:8000")
+CALENDAR_API_POOL_MAX = int(os.getenv("CALENDAR_API_POOL_MAX", "100"))
+CALENDAR_API_POOL_PER_HOST = int(os.getenv("CALENDAR_API_POOL_PER_HOST", "50"))
+CALENDAR_API_KEEPALIVE_TIMEOUT = float(os.getenv("CALENDAR_API_KEEPALIVE_TIMEOUT", "120"))
+# Seconds a /schedules listing is reused across tool calls; writes made here invalidate it
+SCHEDULES_CACHE_TTL = float(os.getenv("SCHEDULES_CACHE_TTL", "5"))
 
 # Type definitions for enum validation
 CategoryType = Literal["Lecture", "Lab", "Meeting", "Office Hours", "Assignment",
                        "Defense", "Workshop", "Study Group", "Seminar", "Grading", "Advising"]
 StatusType = Literal["not_started", "in_progress", "completed"]
 PeriodType = Literal["week", "month", "semester"]
+_CATEGORIES = frozenset(get_args(CategoryType))
+
+# Status filter predicates and priority labels indexed by level
+_STATUS_PREDICATES = {
+    "not_started": lambda s: s == 0.0,
+    "in_progress": lambda s: 0.0 < s < 1.0,
+    "completed": lambda s: s == 1.0,
+}
+PRIORITY = ("", "Low", "Medium", "High")
+
+# Calendar API timestamps are always "YYYY-MM-DD HH:MM:SS"
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+_TS_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+@lru_cache(maxsize=8192)
+def _parse_dt(value: str) -> datetime:
+    """Parse a Calendar API timestamp, raising ValueError if it is not in _TS_FORMAT."""
+    # fromisoformat is much faster than strptime but also accepts other ISO forms
+    if not _TS_RE.fullmatch(value):
+        raise ValueError(f"time data {value!r} does not match format {_TS_FORMAT!r}")
+    return datetime.fromisoformat(value)
+
+# Shared Calendar API session so tool calls reuse pooled keep-alive connections.
+# It is opened and closed by the server lifespan, inside the loop that serves requests.
+_api_session: Optional[aiohttp.ClientSession] = None
+
+def _new_api_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=CALENDAR_API_POOL_MAX,
+                                       limit_per_host=CALENDAR_API_POOL_PER_HOST,
+                                       keepalive_timeout=CALENDAR_API_KEEPALIVE_TIMEOUT,
+                                       # The Calendar API service name rarely changes; skip the 10s default re-resolve
+                                       ttl_dns_cache=300),
+        # connect covers waiting for a pooled connection, so pool starvation fails fast too
+        timeout=aiohttp.ClientTimeout(total=10, connect=3, sock_connect=2, sock_read=5)
+    )
+
+# Lifespans currently holding the shared session open
+_api_session_users = 0
+
+async def _get_api_session() -> aiohttp.ClientSession:
+    """Return the shared Calendar API session, which only exists inside a lifespan.
+
+    A session opened outside one would never be closed, so scripts calling the API
+    helpers directly should wrap them in `async with lifespan(mcp):`.
+    """
+    global _api_session
+    if _api_session_users == 0:
+        raise RuntimeError("Calendar API session is only available inside the server lifespan")
+    if _api_session is None or _api_session.closed:
+        _api_session = _new_api_session()
+    return _api_session
+
+@asynccontextmanager
+async def lifespan(server):
+    """Open the shared Calendar API session and close it once the last lifespan exits.
+
+    Depending on the FastMCP release the lifespan runs once per server or once per SSE
+    connection, so the session is reference-counted rather than closed on every exit.
+    """
+    global _api_session, _api_session_users
+    if _api_session is None or _api_session.closed:
+        _api_session = _new_api_session()
+    _api_session_users += 1
+    try:
+        yield {}
+    finally:
+        _api_session_users -= 1
+        if _api_session_users == 0 and _api_session is not None:
+            await _api_session.close()
+            _api_session = None
 
 # Create FastMCP server
-mcp = FastMCP("calendar-mcp-server")
+mcp = FastMCP("calendar-mcp-server", lifespan=lifespan)
+
+_API_HEADERS = {"Content-Type": "application/json"}
+_BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
 
 async def make_calendar_api_request(method: str, endpoint: str, data: dict = None):
     """Make a request to the Calendar API. Returns dict with 'success' and either 'data' or 'error'."""
     url = f"{CALENDAR_API_BASE_URL}{endpoint}"
-    headers = {"Content-Type": "application/json"}
+    method = method.upper()
 
     try:
-        async with aiohttp.ClientSession() as session:
-            if method.upper() == "GET":
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        return {"success": True, "data": await response.json()}
-                    else:
-                        error_text = await response.text()
-                        return {"success": False, "error": f"API request failed with status {response.status}: {error_text}"}
-            elif method.upper() == "POST":
-                async with session.post(url, headers=headers, json=data) as response:
-                    if response.status == 200:
-                        return {"success": True, "data": await response.json()}
-                    else:
-                        error_text = await response.text()
-                        return {"success": False, "error": f"API request failed with status {response.status}: {error_text}"}
-            elif method.upper() == "PUT":
-                async with session.put(url, headers=headers, json=data) as response:
-                    if response.status == 200:
-                        return {"success": True, "data": await response.json()}
-                    else:
-                        error_text = await response.text()
-                        return {"success": False, "error": f"API request failed with status {response.status}: {error_text}"}
-            elif method.upper() == "DELETE":
-                async with session.delete(url, headers=headers) as response:
-                    if response.status == 200:
-                        return {"success": True, "data": await response.json()}
-                    else:
-                        error_text = await response.text()
-                        return {"success": False, "error": f"API request failed with status {response.status}: {error_text}"}
+        session = await _get_api_session()
+        body = _json_dumps(data) if method in _BODY_METHODS else None
+        async with session.request(method, url, headers=_API_HEADERS, data=body) as response:
+            if response.status == 200:
+                # Parse the raw bytes: response.json() would decode to str first
+                return {"success": True, "data": _json_loads(await response.read())}
+            error_text = await response.text()
+            return {"success": False, "status": response.status,
+                    "error": f"API request failed with status {response.status}: {error_text}"}
     except Exception as e:
-        logger.error(f"Calendar API request failed: {e}")
+        logger.error("Calendar API request failed: %s", e)
         return {"success": False, "error": f"Calendar API request failed: {str(e)}"}
 
+@dataclass
+class _SchedulesIndex:
+    """A /schedules listing with the lookups the query tools need, built once per fetch."""
+    events: list[dict]
+    by_date: dict[str, list[dict]]
+    by_category: dict[str, list[dict]]
+    sorted_by_start: list[dict]  # events with a well-formed start_time, earliest first
+    starts: list[str]  # start times parallel to sorted_by_start, for bisect
+
+def _build_schedules_index(events) -> _SchedulesIndex:
+    """Lower-case each event's text, render its priority and completion once, and bucket
+    the events by date and category.
+
+    Timestamps are zero-padded "YYYY-MM-DD HH:MM:SS" strings, which sort lexicographically
+    in time order, so they are compared as strings and never parsed here.
+    """
+    if not isinstance(events, list):
+        events = []
+    by_date, by_category, timed = {}, {}, []
+    for event in events:
+        start_time = event.get("start_time") or ""
+        if _TS_RE.fullmatch(start_time):
+            timed.append(event)
+        event["_date"] = start_time[:10]
+        event["_name_lc"] = event.get("name", "").lower()
+        event["_content_lc"] = (event.get("content") or "").lower()
+        # Guarded so one malformed row can't fail every tool that reads the index
+        level = event.get("level", 1)
+        event["_priority"] = PRIORITY[level] if level in (1, 2, 3) else "Unknown"
+        event["_pct"] = int((event.get("status") or 0) * 100)
+        by_date.setdefault(event["_date"], []).append(event)
+        by_category.setdefault(event.get("category") or "Unknown", []).append(event)
+    timed.sort(key=lambda e: e["start_time"])
+    return _SchedulesIndex(events=events, by_date=by_date, by_category=by_category,
+                           sorted_by_start=timed, starts=[e["start_time"] for e in timed])
+
+# Last /schedules index as (fetched_at, index); the generation is bumped on every write
+_schedules_cache: tuple[float, Optional[_SchedulesIndex]] = (0.0, None)
+_schedules_generation = 0
+_schedules_lock = asyncio.Lock()
+
+def _cached_schedules_index(cache_ttl: float = SCHEDULES_CACHE_TTL) -> Optional[_SchedulesIndex]:
+    """Return the cached index if it is younger than cache_ttl seconds, without fetching."""
+    fetched_at, index = _schedules_cache
+    if index is not None and time.monotonic() - fetched_at < cache_ttl:
+        return index
+    return None
+
+async def _get_all_schedules(cache_ttl: float = SCHEDULES_CACHE_TTL):
+    """Fetch /schedules, reusing a listing fetched within the last cache_ttl seconds.
+
+    Concurrent callers share a single in-flight request. Returns the same dict shape
+    as make_calendar_api_request, with a _SchedulesIndex as 'data'.
+    """
+    global _schedules_cache
+    async with _schedules_lock:
+        index = _cached_schedules_index(cache_ttl)
+        if index is not None:
+            return {"success": True, "data": index}
+
+        generation = _schedules_generation
+        result = await make_calendar_api_request("GET", "/schedules")
+        if not result["success"]:
+            return result
+        index = _build_schedules_index(result["data"])
+        # Don't keep a listing that a concurrent write has already made stale
+        if generation == _schedules_generation:
+            _schedules_cache = (time.monotonic(), index)
+        return {"success": True, "data": index}
+
+def _invalidate_schedules_cache():
+    """Drop the cached /schedules listing after the calendar has been modified."""
+    global _schedules_cache, _schedules_generation
+    _schedules_generation += 1
+    _schedules_cache = (0.0, None)
+
+# Queries over a _SchedulesIndex, shared by the individual tools and calendar_overview
+def _search_index(index: _SchedulesIndex, query: str) -> list[dict]:
+    q = query.lower()
+    return [e for e in index.events if q in e["_name_lc"] or q in e["_content_lc"]]
+
+def _upcoming_from_index(index: _SchedulesIndex, days: int, category: Optional[str] = None) -> list[dict]:
+    now = datetime.now()
+    # sorted_by_start is ordered by start time, so the window is a contiguous slice
+    lo = bisect.bisect_left(index.starts, now.isoformat(sep=" ", timespec="seconds"))
+    hi = bisect.bisect_right(index.starts, (now + timedelta(days=days)).isoformat(sep=" ", timespec="seconds"))
+    upcoming_events = index.sorted_by_start[lo:hi]
+    if category:
+        upcoming_events = [e for e in upcoming_events if e.get("category") == category]
+    return upcoming_events
+
+def _tally_events(events: list[dict]) -> dict:
+    """Count status bins and categories in a single pass."""
+    completed = in_progress = pending = 0
+    categories = Counter()
+    for event in events:
+        event_status = event.get("status", 0)
+        if event_status == 1.0:
+            completed += 1
+        elif event_status == 0.0:
+            pending += 1
+        elif 0 < event_status < 1.0:
+            in_progress += 1
+        categories[event.get("category") or "Unknown"] += 1
+    return {"total": len(events), "completed": completed, "in_progress": in_progress,
+            "pending": pending, "by_category": dict(sorted(categories.items()))}
+
+# Per-event output lines, filled with str.format_map from an indexed event dict
+_EVENT_DETAIL_LINE = ("• {name} ({category})\n"
+                      "  📅 {start_time} - {end_time}\n"
+                      "  📋 {content}\n"
+                      "  🎯 Priority: {_priority}\n"
+                      "  ✅ Status: {_pct}% complete\n")
+_EVENT_START_LINE = "• {name} ({category})\n  📅 {start_time}"
+_EVENT_TIME_LINE = "• {name} ({category})\n  🕐 {0} - {1}"
+
 @mcp.tool()
 async def get_all_events(
     category: Optional[CategoryType] = None,
@@ -87,41 +283,27 @@ async def get_all_events(
         category (str, optional): Filter by event category (optional)
         status (str, optional): Filter by completion status (optional)
     """
-    result = await make_calendar_api_request("GET", "/schedules")
+    result = await _get_all_schedules()
 
     if not result["success"]:
         return f"❌ Error: {result['error']}"
 
-    events = result["data"] if isinstance(result["data"], list) else []
+    index = result["data"]
+    events = index.events
 
-    # Apply filters
+    # Apply filters: the category is a bucket lookup, so at most one pass is left for status
     if category:
-        events = [e for e in events if e.get("category") == category]
+        events = index.by_category.get(category, [])
     if status:
-        status_map = {"not_started": 0.0, "in_progress": 0.5, "completed": 1.0}
-        target_status = status_map.get(status)
-        if target_status is not None:
-            if target_status == 0.0:
-                events = [e for e in events if e.get("status", 0) == 0.0]
-            elif target_status == 0.5:
-                events = [e for e in events if 0.0 < e.get("status", 0) < 1.0]
-            else:
-                events = [e for e in events if e.get("status", 0) == 1.0]
+        predicate = _STATUS_PREDICATES[status]
+        events = [e for e in events if predicate(e.get("status", 0))]
 
-    summary = f"Found {len(events)} events in Redwood Digital University calendar\n\n"
-    event_list = "\n".join([
-        f"• {event['name']} ({event['category']})\n"
-        f"  📅 {event['start_time']} - {event['end_time']}\n"
-        f"  📋 {event.get('content', 'No description')}\n"
-        f"  🎯 Priority: {['', 'Low', 'Medium', 'High'][event.get('level', 1)]}\n"
-        f"  ✅ Status: {int(event.get('status', 0) * 100)}% complete\n"
-        for event in events[:10]
-    ])
+    total = len(events)
+    parts = [_EVENT_DETAIL_LINE.format_map(event) for event in islice(events, 10)]
+    if total > 10:
+        parts.append(f"... and {total - 10} more events")
 
-    if len(events) > 10:
-        event_list += f"\n... and {len(events) - 10} more events"
-
-    return summary + event_list
+    return f"Found {total} events in Redwood Digital University calendar\n\n" + "\n".join(parts)
 
 @mcp.tool()
 async def get_event(event_id: str) -> str:
@@ -147,11 +329,48 @@ async def get_event(event_id: str) -> str:
 • Start: {event['start_time']}
 • End: {event['end_time']}
 
-🎯 **Priority:** {['', 'Low', 'Medium', 'High'][event.get('level', 1)]}
+🎯 **Priority:** {PRIORITY[event.get('level', 1)]}
 ✅ **Status:** {int(event.get('status', 0) * 100)}% complete
 🆔 **Event ID:** {event['sid']}
 🕐 **Created:** {event.get('creation_time', 'Unknown')}"""
 
+_last_sid_ns = 0
+
+def _new_event_sid(now_ns: int) -> str:
+    """Nanosecond-timestamp event id, bumped so ids can't repeat if the clock stalls or steps back."""
+    global _last_sid_ns
+    _last_sid_ns = max(now_ns, _last_sid_ns + 1)
+    return f"mcp-event-{_last_sid_ns}"
+
+async def _create_event_request(name: str, category: str, level, start_time: str, end_time: str,
+                                content: str = ""):
+    """Validate and POST a new event. Returns the same dict shape as make_calendar_api_request."""
+    # Validate datetime format
+    try:
+        _parse_dt(start_time)
+        _parse_dt(end_time)
+    except ValueError as e:
+        return {"success": False, "error": f"Invalid datetime format. Please use YYYY-MM-DD HH:MM:SS format. Details: {str(e)}"}
+
+    # One clock read for both the id and creation_time so they can't straddle a second
+    now_ns = time.time_ns()
+
+    event_data = {
+        "sid": _new_event_sid(now_ns),
+        "name": name,
+        "content": content,
+        "category": category,
+        "level": int(level),
+        "status": 0.0,
+        "creation_time": datetime.fromtimestamp(now_ns // 1_000_000_000).isoformat(sep=" ", timespec="seconds"),
+        "start_time": start_time,
+        "end_time": end_time
+    }
+
+    result = await make_calendar_api_request("POST", "/schedules", event_data)
+    _invalidate_schedules_cache()
+    return result
+
 @mcp.tool()
 async def create_event(
     name: str,
@@ -173,29 +392,7 @@ async def create_event(
 
     Note: New events are automatically created with status=0.0 (not started). Do NOT try to set the status parameter.
     """
-    # Validate datetime format
-    try:
-        datetime.strptime(start_time, "%Y-%m-%d %H:%M:%S")
-        datetime.strptime(end_time, "%Y-%m-%d %H:%M:%S")
-    except ValueError as e:
-        return f"❌ Error: Invalid datetime format. Please use YYYY-MM-DD HH:MM:SS format. Details: {str(e)}"
-
-    timestamp = int(datetime.now().timestamp() * 1000)
-    sid = f"mcp-event-{timestamp}"
-
-    event_data = {
-        "sid": sid,
-        "name": name,
-        "content": content,
-        "category": category,
-        "level": int(level),
-        "status": 0.0,
-        "creation_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "start_time": start_time,
-        "end_time": end_time
-    }
-
-    result = await make_calendar_api_request("POST", "/schedules", event_data)
+    result = await _create_event_request(name, category, level, start_time, end_time, content)
 
     if not result["success"]:
         return f"❌ Error: {result['error']}"
@@ -203,6 +400,53 @@ async def create_event(
     event = result["data"]
     return f"✅ Event created successfully!\n\n🎓 **{event['name']}**\n📋 Category: {event['category']}\n📅 Time: {event['start_time']} - {event['end_time']}\n🆔 Event ID: {event['sid']}"
 
+# Cleared the first time the Calendar API answers a PATCH with 405 (older deployments)
+_patch_supported = True
+
+async def _put_merged_event(event_id: str, changes: dict):
+    """Update an event with GET + PUT for Calendar APIs without PATCH support."""
+    current_result = await make_calendar_api_request("GET", f"/schedules/{event_id}")
+
+    if not current_result["success"]:
+        return current_result
+
+    current_event = current_result["data"]
+    if isinstance(current_event, list) and current_event:
+        current_event = current_event[0]
+
+    # Merge the changes over the current data; PUT expects every field
+    update_data = {
+        "sid": event_id,
+        "name": current_event["name"],
+        "content": current_event.get("content", ""),
+        "category": current_event["category"],
+        "level": current_event["level"],
+        "status": current_event.get("status", 0.0),
+        "creation_time": current_event.get("creation_time"),
+        "start_time": current_event["start_time"],
+        "end_time": current_event["end_time"],
+        **changes
+    }
+
+    return await make_calendar_api_request("PUT", f"/schedules/{event_id}", update_data)
+
+_UPDATE_FIELDS = frozenset({"name", "content", "category", "level", "status", "start_time", "end_time"})
+
+async def _update_event_request(event_id: str, changes: dict):
+    """Apply changes to an event with PATCH, or GET + PUT if the Calendar API lacks PATCH."""
+    global _patch_supported
+    result = None
+    if _patch_supported:
+        result = await make_calendar_api_request("PATCH", f"/schedules/{event_id}", changes)
+        if result.get("status") == 405:
+            logger.info("Calendar API does not support PATCH, falling back to GET + PUT")
+            _patch_supported = False
+            result = None
+    if result is None:
+        result = await _put_merged_event(event_id, changes)
+    _invalidate_schedules_cache()
+    return result
+
 @mcp.tool()
 async def update_event(
     event_id: str,
@@ -226,30 +470,12 @@ async def update_event(
         start_time (str, optional): Start time in YYYY-MM-DD HH:MM:SS format (optional)
         end_time (str, optional): End time in YYYY-MM-DD HH:MM:SS format (optional)
     """
-    # Get current event data first
-    current_result = await make_calendar_api_request("GET", f"/schedules/{event_id}")
-
-    if not current_result["success"]:
-        return f"❌ Error: {current_result['error']}"
-
-    current_event = current_result["data"]
-    if isinstance(current_event, list) and current_event:
-        current_event = current_event[0]
-
-    # Prepare update data (merge with current data)
-    update_data = {
-        "sid": event_id,
-        "name": name if name is not None else current_event["name"],
-        "content": content if content is not None else current_event.get("content", ""),
-        "category": category if category is not None else current_event["category"],
-        "level": level if level is not None else current_event["level"],
-        "status": status if status is not None else current_event.get("status", 0.0),
-        "creation_time": current_event.get("creation_time"),
-        "start_time": start_time if start_time is not None else current_event["start_time"],
-        "end_time": end_time if end_time is not None else current_event["end_time"]
-    }
+    changes = {field: value for field, value in (
+        ("name", name), ("content", content), ("category", category), ("level", level),
+        ("status", status), ("start_time", start_time), ("end_time", end_time)
+    ) if value is not None}
 
-    result = await make_calendar_api_request("PUT", f"/schedules/{event_id}", update_data)
+    result = await _update_event_request(event_id, changes)
 
     if not result["success"]:
         return f"❌ Error: {result['error']}"
@@ -265,12 +491,86 @@ async def delete_event(event_id: str) -> str:
         event_id (str): Event ID to delete
     """
     result = await make_calendar_api_request("DELETE", f"/schedules/{event_id}")
+    _invalidate_schedules_cache()
 
     if not result["success"]:
         return f"❌ Error: {result['error']}"
 
     return f"🗑️ Event deleted successfully: {event_id}"
 
+@mcp.tool()
+async def bulk_modify_events(operations: list[dict]) -> str:
+    """Create, update and delete several events in one call.
+
+    Prefer this over calling create_event, update_event or delete_event repeatedly
+    whenever more than one change is needed. Operations on different events run
+    concurrently; operations on the same event_id run in the order given.
+
+    Args:
+        operations (list): Operations to apply, each with an "op" plus that tool's arguments:
+            {"op": "create", "name": ..., "category": ..., "level": 1-3, "start_time": ..., "end_time": ..., "content": ...},
+            {"op": "update", "event_id": ..., and any of name, content, category, level, status, start_time, end_time},
+            {"op": "delete", "event_id": ...}
+            Times use YYYY-MM-DD HH:MM:SS format; categories are the same as for create_event.
+    """
+    async def apply(operation: dict) -> tuple[bool, str]:
+        op = operation.get("op")
+        try:
+            if op == "create":
+                args = (operation["name"], operation["category"], operation["level"],
+                        operation["start_time"], operation["end_time"], operation.get("content", ""))
+                if operation["category"] not in _CATEGORIES:
+                    return False, f"create: unknown category {operation['category']!r}"
+            elif op in ("update", "delete"):
+                event_id = operation["event_id"]
+            else:
+                return False, f"unknown op {op!r}; expected create, update or delete"
+        except KeyError as e:
+            return False, f"{op}: missing field {e}"
+
+        if op == "update":
+            changes = {k: v for k, v in operation.items() if k not in ("op", "event_id") and v is not None}
+            if changes.keys() - _UPDATE_FIELDS:
+                return False, f"update: unknown fields {sorted(changes.keys() - _UPDATE_FIELDS)}"
+            if "category" in changes and changes["category"] not in _CATEGORIES:
+                return False, f"update: unknown category {changes['category']!r}"
+
+        try:
+            if op == "create":
+                result = await _create_event_request(*args)
+            elif op == "update":
+                result = await _update_event_request(event_id, changes)
+            else:
+                result = await make_calendar_api_request("DELETE", f"/schedules/{event_id}")
+        except (TypeError, ValueError) as e:
+            return False, f"{op}: {e}"
+
+        if not result["success"]:
+            return False, f"{op}: {result['error']}"
+        if op == "delete":
+            return True, f"deleted {event_id}"
+        event = result["data"]
+        return True, f"{'created' if op == 'create' else 'updated'} {event['name']} (🆔 {event['sid']})"
+
+    # Chain the operations that target the same event so they apply in list order
+    chains = {}
+    for i, operation in enumerate(operations):
+        event_id = operation.get("event_id") if operation.get("op") in ("update", "delete") else None
+        chains.setdefault(("event", event_id) if isinstance(event_id, str) else ("op", i), []).append(i)
+
+    outcomes = [None] * len(operations)
+
+    async def run_chain(indices: list[int]):
+        for i in indices:
+            outcomes[i] = await apply(operations[i])
+
+    await asyncio.gather(*(run_chain(indices) for indices in chains.values()))
+    _invalidate_schedules_cache()
+
+    succeeded = sum(ok for ok, _ in outcomes)
+    lines = [f"{i}. {'✅' if ok else '❌'} {message}" for i, (ok, message) in enumerate(outcomes, 1)]
+    return f"📦 Applied {succeeded}/{len(outcomes)} operations\n\n" + "\n".join(lines)
+
 @mcp.tool()
 async def search_events(query: str) -> str:
     """Search events by name or content.
@@ -278,24 +578,21 @@ async def search_events(query: str) -> str:
     Args:
         query (str): Search query to match against event names and descriptions
     """
-    result = await make_calendar_api_request("GET", "/schedules")
+    # A warm listing answers locally; otherwise let the Calendar API return only the matches
+    index = _cached_schedules_index()
+    if index is None:
+        result = await make_calendar_api_request("GET", f"/schedules?q={quote(query)}")
 
-    if not result["success"]:
-        return f"❌ Error: {result['error']}"
+        if not result["success"]:
+            return f"❌ Error: {result['error']}"
 
-    all_events = result["data"]
+        # Re-check locally: older Calendar APIs ignore q and return every event
+        index = _build_schedules_index(result["data"])
 
-    matching_events = []
-    for event in all_events:
-        if (query.lower() in event["name"].lower() or
-            query.lower() in event.get("content", "").lower()):
-            matching_events.append(event)
+    matching_events = _search_index(index, query)
 
     summary = f"🔍 Search results for '{query}': {len(matching_events)} events found\n\n"
-    event_list = "\n".join([
-        f"• {event['name']} ({event['category']})\n  📅 {event['start_time']}"
-        for event in matching_events[:10]
-    ])
+    event_list = "\n".join([_EVENT_START_LINE.format_map(event) for event in matching_events[:10]])
 
     return summary + (event_list if event_list else "No events match your search query.")
 
@@ -310,37 +607,19 @@ async def get_upcoming_events(
         days (int): Number of days to look ahead (1-30, default: 7)
         category (str, optional): Filter by event category (optional)
     """
-    result = await make_calendar_api_request("GET", "/schedules")
+    result = await _get_all_schedules()
 
     if not result["success"]:
         return f"❌ Error: {result['error']}"
 
-    all_events = result["data"]
-
-    now = datetime.now()
-    future_date = now + timedelta(days=days)
-
-    upcoming_events = []
-    for event in all_events:
-        try:
-            event_start = datetime.strptime(event["start_time"], "%Y-%m-%d %H:%M:%S")
-            if now <= event_start <= future_date:
-                if not category or event.get("category") == category:
-                    upcoming_events.append(event)
-        except:
-            continue
-
-    upcoming_events.sort(key=lambda x: x["start_time"])
+    upcoming_events = _upcoming_from_index(result["data"], days, category)
 
     summary = f"📅 Upcoming events in next {days} day{'s' if days != 1 else ''}"
     if category:
         summary += f" (filtered by {category})"
     summary += f": {len(upcoming_events)} found\n\n"
 
-    event_list = "\n".join([
-        f"• {event['name']} ({event['category']})\n  📅 {event['start_time']}"
-        for event in upcoming_events[:10]
-    ])
+    event_list = "\n".join([_EVENT_START_LINE.format_map(event) for event in upcoming_events[:10]])
 
     return summary + event_list
 
@@ -351,26 +630,17 @@ async def get_events_by_date(date: str) -> str:
     Args:
         date (str): Date in YYYY-MM-DD format
     """
-    result = await make_calendar_api_request("GET", "/schedules")
+    result = await _get_all_schedules()
 
     if not result["success"]:
         return f"❌ Error: {result['error']}"
 
-    all_events = result["data"]
-
-    date_events = []
-    for event in all_events:
-        try:
-            event_date = event["start_time"].split()[0]  # Extract date part
-            if event_date == date:
-                date_events.append(event)
-        except:
-            continue
+    date_events = result["data"].by_date.get(date, [])
 
     summary = f"📅 Events on {date}: {len(date_events)} found\n\n"
 
     event_list = "\n".join([
-        f"• {event['name']} ({event['category']})\n  🕐 {event['start_time'].split()[1]} - {event['end_time'].split()[1]}"
+        _EVENT_TIME_LINE.format(event["start_time"][11:], event["end_time"][11:], **event)
         for event in date_events
     ])
 
@@ -383,26 +653,20 @@ async def get_calendar_statistics(period: PeriodType = "month") -> str:
     Args:
         period (str): Time period for statistics
     """
-    result = await make_calendar_api_request("GET", "/schedules")
+    result = await _get_all_schedules()
 
     if not result["success"]:
         return f"❌ Error: {result['error']}"
 
-    all_events = result["data"]
-
-    total_events = len(all_events)
-    completed_events = len([e for e in all_events if e.get("status", 0) == 1.0])
-    in_progress_events = len([e for e in all_events if 0 < e.get("status", 0) < 1.0])
-    pending_events = len([e for e in all_events if e.get("status", 0) == 0.0])
-
-    categories = {}
-    for event in all_events:
-        cat = event.get("category", "Unknown")
-        categories[cat] = categories.get(cat, 0) + 1
+    stats = _tally_events(result["data"].events)
+    total_events = stats["total"]
+    completed_events = stats["completed"]
+    in_progress_events = stats["in_progress"]
+    pending_events = stats["pending"]
 
     category_breakdown = "\n".join([
         f"• {cat}: {count} events"
-        for cat, count in sorted(categories.items())
+        for cat, count in stats["by_category"].items()
     ])
 
     completion_rate = (completed_events / total_events * 100) if total_events > 0 else 0
@@ -420,13 +684,69 @@ async def get_calendar_statistics(period: PeriodType = "month") -> str:
 
 🎯 **Academic Activity Level:** {'High' if total_events > 50 else 'Medium' if total_events > 20 else 'Low'}"""
 
+def _public_fields(events: list[dict]) -> list[dict]:
+    """Strip the index's private _-prefixed keys before returning events to a client."""
+    return [{k: v for k, v in event.items() if not k.startswith("_")} for event in events]
+
+# calendar_overview operations: (index, query spec) -> JSON-serializable result
+_OVERVIEW_OPS = {
+    "by_date": lambda index, q: _public_fields(index.by_date.get(q["date"], [])),
+    "by_category": lambda index, q: _public_fields(index.by_category.get(q["category"], [])),
+    # days is clamped to the 1-30 range get_upcoming_events documents
+    "upcoming": lambda index, q: _public_fields(
+        _upcoming_from_index(index, min(max(int(q.get("days", 7)), 1), 30), q.get("category"))),
+    "search": lambda index, q: _public_fields(_search_index(index, q["query"])),
+    "stats": lambda index, q: _tally_events(index.events),
+}
+
+@mcp.tool()
+async def calendar_overview(queries: list[dict]) -> str:
+    """Answer several calendar questions from a single fetch of the schedule.
+
+    Prefer this over calling the individual query tools one after another.
+
+    Args:
+        queries (list): Query specs, each with an "op" and its parameters:
+            {"op": "by_date", "date": "YYYY-MM-DD"},
+            {"op": "by_category", "category": "Lecture"},
+            {"op": "upcoming", "days": 7, "category": "Lab"} (days 1-30, category optional),
+            {"op": "search", "query": "machine learning"},
+            {"op": "stats"}
+
+    Returns a JSON list with one {"op", "result"} or {"op", "error"} entry per query, in order.
+    """
+    result = await _get_all_schedules()
+
+    if not result["success"]:
+        return f"❌ Error: {result['error']}"
+
+    index = result["data"]
+
+    def dispatch(query: dict) -> dict:
+        op = query.get("op")
+        handler = _OVERVIEW_OPS.get(op)
+        if handler is None:
+            return {"op": op, "error": f"Unknown op; expected one of {sorted(_OVERVIEW_OPS)}"}
+        try:
+            return {"op": op, "result": handler(index, query)}
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            return {"op": op, "error": f"Invalid query: {e!r}"}
+
+    return _json_dumps([dispatch(query) for query in queries]).decode()
+
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:  # uvloop is optional (and unavailable on Windows); keep the default loop
+        pass
+
     logger.info("🎓 Starting Redwood Digital University Calendar MCP Server")
-    logger.info(f"📡 Calendar API URL: {CALENDAR_API_BASE_URL}")
-    logger.info(f"🚀 Transport mode: {MCP_TRANSPORT}")
+    logger.info("📡 Calendar API URL: %s", CALENDAR_API_BASE_URL)
+    logger.info("🚀 Transport mode: %s", MCP_TRANSPORT)
 
     if MCP_TRANSPORT.lower() == "sse":
-        logger.info(f"🔄 Starting SSE server on {MCP_HOST}:{MCP_PORT}...")
+        logger.info("🔄 Starting SSE server on %s:%s...", MCP_HOST, MCP_PORT)
         mcp.run(transport="sse", host=MCP_HOST, port=MCP_PORT)
     else:
         logger.info("🔄 Starting stdio server...")
@@ -4,9 +4,7 @@ Simple MCP client for testing the Calendar MCP Server over SSE.
 """
 
 import asyncio
-import json
-import httpx
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession
 from mcp.client.sse import sse_client
 
 
@@ -31,33 +29,21 @@ async def test_calendar_mcp():
             for tool in tools.tools:
                 print(f"  - {tool.name}: {tool.description}")
 
-            # Test 1: Get all events
-            print("\n🗓️  Test 1: Getting all events...")
-            result = await session.call_tool("get_all_events", arguments={})
-            print("Result:")
-            for content in result.content:
-                print(content.text)
-
-            # Test 2: Search for lectures
-            print("\n🔍 Test 2: Searching for 'lecture'...")
-            result = await session.call_tool("search_events", arguments={"query": "lecture"})
-            print("Result:")
-            for content in result.content:
-                print(content.text)
-
-            # Test 3: Get upcoming events
-            print("\n📅 Test 3: Getting upcoming events (next 7 days)...")
-            result = await session.call_tool("get_upcoming_events", arguments={"days": 7})
-            print("Result:")
-            for content in result.content:
-                print(content.text)
-
-            # Test 4: Get calendar statistics
-            print("\n📊 Test 4: Getting calendar statistics...")
-            result = await session.call_tool("get_calendar_statistics", arguments={"period": "month"})
-            print("Result:")
-            for content in result.content:
-                print(content.text)
+            # Tests 1-4 are read-only, so issue them concurrently on the same session
+            read_only_tests = [
+                ("🗓️  Test 1: Getting all events...", "get_all_events", {}),
+                ("🔍 Test 2: Searching for 'lecture'...", "search_events", {"query": "lecture"}),
+                ("📅 Test 3: Getting upcoming events (next 7 days)...", "get_upcoming_events", {"days": 7}),
+                ("📊 Test 4: Getting calendar statistics...", "get_calendar_statistics", {"period": "month"}),
+            ]
+            results = await asyncio.gather(*(
+                session.call_tool(tool, arguments=arguments) for _, tool, arguments in read_only_tests
+            ))
+            for (title, _, _), result in zip(read_only_tests, results):
+                print(f"\n{title}")
+                print("Result:")
+                for content in result.content:
+                    print(content.text)
 
             # Test 5: Create a new event
             print("\n➕ Test 5: Creating a new event...")